@@ -4,12 +4,15 @@ import json
 import logging
 import os
 import sqlite3
-from typing import Dict, List
+import time
+from typing import Dict, List, Set, Tuple
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 DB_PATH = os.getenv("SQLITE_PATH", "news.db")
+# 출처 목록·전체 기사 수처럼 자주 조회되지만 드물게 바뀌는 값의 캐시 유지 시간(초)
+CACHE_TTL_SECONDS = 60
 
 class Database:
     def __init__(self, db_path):
@@ -17,11 +20,20 @@ class Database:
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
+        # (캐시 시각, 값) — 시각이 0이면 무효화된 상태
+        self._sources_cache: Tuple[float, List[str]] = (0.0, [])
+        self._count_cache: Tuple[float, int] = (0.0, 0)
+
+    def _invalidate_caches(self):
+        self._sources_cache = (0.0, [])
+        self._count_cache = (0.0, 0)
 
     def get_connection(self):
         """데이터베이스 연결을 생성하고 반환합니다."""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
+        # WAL 모드에서는 NORMAL 동기화로도 안전하며 커밋마다의 fsync 비용이 줄어듭니다.
+        conn.execute("PRAGMA synchronous=NORMAL")
         return conn
 
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict]:
@@ -40,6 +52,7 @@ class Database:
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS articles (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -62,6 +75,16 @@ class Database:
                     FOREIGN KEY (article_id) REFERENCES articles (id) ON DELETE CASCADE
                 )
             """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published DESC)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pending_keyword_batches (
+                    batch_id TEXT PRIMARY KEY,
+                    link_map TEXT NOT NULL, -- custom_id(링크 해시) -> 링크
+                    error_count INTEGER DEFAULT 0, -- 누적 조회 실패 횟수
+                    created_at TEXT DEFAULT (datetime('now', 'localtime'))
+                )
+            """)
             conn.commit()
             logger.info("✅ 데이터베이스 테이블이 준비되었습니다.")
         finally:
@@ -101,10 +124,104 @@ class Database:
                 result = "inserted"
             
             conn.commit()
+            if result == "inserted": self._invalidate_caches()
             return result
         finally:
             conn.close()
 
+    def insert_articles_bulk(self, articles: List[Dict]) -> int:
+        """기사들을 한 트랜잭션에서 executemany로 추가하고, 실제로 추가된 행 수를 반환합니다.
+
+        이미 존재하는 링크는 INSERT OR IGNORE로 건너뜁니다.
+        """
+        rows = [(
+            article['title'], article['link'], article['published'],
+            article['source'], article['summary'], json.dumps(article.get('keywords', [])),
+            article.get('raw_text', ''), article.get('main_category', '기타'),
+            article.get('sub_category', '기타'), article.get('language', '')
+        ) for article in articles]
+
+        conn = self.get_connection()
+        try:
+            before = conn.total_changes
+            with conn:
+                conn.executemany("""
+                    INSERT OR IGNORE INTO articles (title, link, published, source, summary, keywords, raw_text, main_category, sub_category, language)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+            inserted = conn.total_changes - before
+        finally:
+            conn.close()
+
+        if inserted:
+            # 새 출처가 생겼을 수 있으므로 출처 캐시는 비우고, 기사 수 캐시는 추가된 만큼만 갱신
+            self._sources_cache = (0.0, [])
+            cached_at, count = self._count_cache
+            self._count_cache = (cached_at, count + inserted)
+        return inserted
+
+    def get_existing_links(self, links: List[str]) -> Set[str]:
+        """주어진 링크 중 이미 저장된 링크들을 반환합니다 (link UNIQUE 인덱스 조회)."""
+        existing = set()
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            for start in range(0, len(links), 500):
+                chunk = links[start:start + 500]
+                cursor.execute(f"SELECT link FROM articles WHERE link IN ({','.join('?' * len(chunk))})", chunk)
+                existing.update(row['link'] for row in cursor.fetchall())
+            return existing
+        finally:
+            conn.close()
+
+    def update_articles_keywords_bulk(self, keywords_by_link: Dict[str, List[str]]) -> int:
+        """링크별 키워드를 한 트랜잭션에서 executemany로 갱신하고, 갱신된 행 수를 반환합니다."""
+        rows = [(json.dumps(keywords), link) for link, keywords in keywords_by_link.items()]
+        conn = self.get_connection()
+        try:
+            before = conn.total_changes
+            with conn:
+                conn.executemany("UPDATE articles SET keywords = ? WHERE link = ?", rows)
+            return conn.total_changes - before
+        finally:
+            conn.close()
+
+    def add_pending_keyword_batch(self, batch_id: str, link_map: Dict[str, str]):
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR REPLACE INTO pending_keyword_batches (batch_id, link_map) VALUES (?, ?)",
+                           (batch_id, json.dumps(link_map)))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_pending_keyword_batches(self) -> List[Dict]:
+        rows = self.execute_query("SELECT batch_id, link_map FROM pending_keyword_batches ORDER BY created_at")
+        for row in rows:
+            row['link_map'] = json.loads(row['link_map'])
+        return rows
+
+    def remove_pending_keyword_batch(self, batch_id: str):
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor(); cursor.execute("DELETE FROM pending_keyword_batches WHERE batch_id = ?", (batch_id,)); conn.commit()
+        finally:
+            conn.close()
+
+    def record_keyword_batch_error(self, batch_id: str) -> int:
+        """배치 조회 실패 횟수를 1 늘리고 누적 횟수를 반환합니다."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE pending_keyword_batches SET error_count = error_count + 1 WHERE batch_id = ?", (batch_id,))
+            cursor.execute("SELECT error_count FROM pending_keyword_batches WHERE batch_id = ?", (batch_id,))
+            row = cursor.fetchone()
+            conn.commit()
+            return row['error_count'] if row else 0
+        finally:
+            conn.close()
+
     def get_articles_with_filters(self, limit: int, offset: int, **filters) -> List[Dict]:
         """모든 조건으로 기사를 필터링하여 조회합니다."""
         conn = self.get_connection()
@@ -136,12 +253,26 @@ class Database:
             conn.close()
 
     def get_all_sources(self) -> List[str]:
+        cached_at, sources = self._sources_cache
+        if time.time() - cached_at < CACHE_TTL_SECONDS:
+            return list(sources)
         conn = self.get_connection()
         try:
             cursor = conn.cursor(); cursor.execute("SELECT DISTINCT source FROM articles WHERE source IS NOT NULL ORDER BY source")
-            return [row['source'] for row in cursor.fetchall()]
+            sources = [row['source'] for row in cursor.fetchall()]
         finally:
             conn.close()
+        self._sources_cache = (time.time(), sources)
+        return list(sources)
+
+    def count_articles(self) -> int:
+        """전체 기사 수를 반환합니다. TTL 동안은 캐시된 값(일괄 추가 시 증가분 반영)을 사용합니다."""
+        cached_at, count = self._count_cache
+        if time.time() - cached_at < CACHE_TTL_SECONDS:
+            return count
+        count = self.execute_query("SELECT COUNT(*) as count FROM articles")[0]['count']
+        self._count_cache = (time.time(), count)
+        return count
 
     def get_keyword_stats(self, limit: int) -> List[Dict]:
         conn = self.get_connection()
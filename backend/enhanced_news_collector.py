@@ -1,18 +1,21 @@
 # backend/enhanced_news_collector.py (카테고리 분류 기능이 추가된 최종 버전)
 
+import asyncio
+import io
 import logging
 import time
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
 from datetime import datetime
 
+import aiohttp
 import feedparser
-import requests
 from bs4 import BeautifulSoup
-import dateutil.parser
+from dateutil import parser as dateparser
+from lxml import etree
 
 from database import db
+from keyword_maker import iter_keyword_batches, submit_keyword_batch
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,10 +46,61 @@ FEEDS = [
     {"feed_url": "https://www.theverge.com/rss/index.xml", "source": "The Verge"},
 ]
 
+FEED_TIMEOUT = aiohttp.ClientTimeout(total=20)
+MAX_CONNECTIONS = 32
+MAX_ENTRIES_PER_FEED = 20
+
+def _localname(tag) -> str:
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+def parse_rss_fast(xml_bytes: bytes, max_items: int = MAX_ENTRIES_PER_FEED) -> List[Dict]:
+    """lxml iterparse로 RSS <item> / Atom <entry>를 스트리밍 파싱합니다.
+
+    처리한 요소는 즉시 메모리에서 해제하고 max_items개를 읽으면 중단합니다.
+    파싱에 실패하면 빈 리스트를 반환하므로 호출 측에서 feedparser로 대체합니다.
+    """
+    entries = []
+    try:
+        for _, elem in etree.iterparse(io.BytesIO(xml_bytes), events=('end',),
+                                       resolve_entities=False, no_network=True):
+            if _localname(elem.tag) not in ('item', 'entry'):
+                continue
+
+            fields = {}
+            for child in elem:
+                name = _localname(child.tag)
+                text = ''.join(child.itertext()).strip()
+                if name == 'link':
+                    href = child.get('href')
+                    if href is None: fields.setdefault('link', text)
+                    elif child.get('rel', 'alternate') == 'alternate': fields.setdefault('link', href.strip())
+                elif text:
+                    fields.setdefault(name, text)
+
+            entries.append({
+                'title': fields.get('title', ''),
+                'link': fields.get('link', ''),
+                'published': fields.get('pubDate') or fields.get('published') or fields.get('date') or fields.get('updated', ''),
+                'summary': fields.get('description') or fields.get('summary') or fields.get('encoded') or fields.get('content', ''),
+            })
+
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+            if len(entries) >= max_items:
+                break
+    except etree.LxmlError as e:
+        logger.debug(f"lxml 파싱 실패, feedparser로 대체합니다: {e}")
+        return []
+    return entries
+
 class EnhancedNewsCollector:
     def __init__(self):
-        self.session = requests.Session()
         self.stats = {}
+        # 백그라운드 키워드 보강 진행 상황 (/api/keywords/status)
+        self.enrichment_status = {'running': False, 'total': 0, 'processed': 0, 'updated': 0,
+                                  'started_at': None, 'finished_at': None}
+        self._enrich_tasks = set()
 
     def _classify_article(self, title: str, content: str) -> Dict:
         """[추가된 기능] 기사 제목/본문으로 카테고리를 자동 분류합니다."""
@@ -75,8 +129,8 @@ class EnhancedNewsCollector:
         link = entry.get("link", "").strip()
         if not title or not link: return None
 
-        try: published = dateutil.parser.parse(entry.get("published", "")).isoformat()
-        except: published = datetime.now().isoformat()
+        try: published = dateparser.parse(entry.get("published", "")).isoformat()
+        except (ValueError, OverflowError, TypeError): published = datetime.now().isoformat()
 
         summary = BeautifulSoup(entry.get("summary", ""), "html.parser").get_text(separator=' ', strip=True)
         keywords = self._extract_keywords_simple(f"{title} {summary}")
@@ -92,17 +146,19 @@ class EnhancedNewsCollector:
         }
         return article_data
 
-    def collect_from_feed(self, feed_config: Dict) -> List[Dict]:
+    async def fetch_feed(self, session: aiohttp.ClientSession, feed_config: Dict) -> List[Dict]:
         feed_url, source = feed_config.get("feed_url"), feed_config.get("source", "Unknown")
         logger.info(f"📡 {source}에서 뉴스 수집 시작...")
         try:
-            response = self.session.get(feed_url, timeout=20)
-            response.raise_for_status()
-            feed = feedparser.parse(response.content)
-            if not feed or not feed.entries:
+            async with session.get(feed_url, timeout=FEED_TIMEOUT) as response:
+                response.raise_for_status()
+                content = await response.read()
+            # Atom/FeedBurner 변형 등 lxml로 읽지 못한 피드는 feedparser로 대체
+            entries = parse_rss_fast(content) or feedparser.parse(content).entries[:MAX_ENTRIES_PER_FEED]
+            if not entries:
                 logger.warning(f"❌ {source}에서 기사를 찾을 수 없습니다."); return []
             
-            articles = [self._process_entry(entry, source) for entry in feed.entries[:20]]
+            articles = [self._process_entry(entry, source) for entry in entries]
             valid_articles = [article for article in articles if article]
             logger.info(f"✅ {source}: {len(valid_articles)}개 기사 처리 완료.")
             return valid_articles
@@ -111,32 +167,102 @@ class EnhancedNewsCollector:
 
     def save_articles(self, articles: List[Dict]) -> Dict:
         stats = {'inserted': 0, 'updated': 0, 'skipped': 0}
-        for article in articles:
-            try:
-                result = db.insert_or_update_article(article); stats[result] += 1
-            except Exception as e:
-                logger.error(f"DB 저장 오류 ({article.get('link')}): {e}"); stats['skipped'] += 1
+        try:
+            stats['inserted'] = db.insert_articles_bulk(articles)
+        except Exception as e:
+            logger.error(f"DB 일괄 저장 오류 ({len(articles)}건): {e}")
+        stats['skipped'] = len(articles) - stats['inserted']
         return stats
 
-    def collect_all_news(self, max_feeds: Optional[int] = None) -> Dict:
+    def _store_articles(self, articles: List[Dict], use_batch_api: bool):
+        """새 기사를 DB에 저장합니다 (블로킹 작업이므로 이벤트 루프 밖의 스레드에서 실행됩니다).
+
+        이미 저장된 링크는 건너뛰며, 새 기사는 로컬에서 뽑은 임시 키워드로 먼저 저장됩니다.
+        """
+        batch_id = None
+        known_links = db.get_existing_links([article['link'] for article in articles])
+        articles = [article for article in articles if article['link'] not in known_links]
+        save_stats = {'inserted': 0, 'updated': 0, 'skipped': len(known_links)}
+        if not articles:
+            return save_stats, batch_id, articles
+
+        for key, count in self.save_articles(articles).items():
+            save_stats[key] += count
+        if use_batch_api:
+            # 키워드는 Batch API 결과가 나오면 /api/keywords/drain 에서 갱신됩니다.
+            try: batch_id = submit_keyword_batch(articles)
+            except Exception as e: logger.error(f"❌ 키워드 배치 제출 실패: {e}")
+        return save_stats, batch_id, articles
+
+    async def enrich_keywords(self, articles: List[Dict], batch_size: int = 20, concurrency: int = 10):
+        """저장된 기사의 키워드를 batch_size개씩 묶은 OpenAI 요청으로 동시에 추출하고, 끝난 묶음마다 일괄 UPDATE 합니다."""
+        status = self.enrichment_status
+        try:
+            texts = [f"{article['title']} {article['summary']}" for article in articles]
+            async for indices, keywords_list in iter_keyword_batches(texts, batch_size, concurrency):
+                keywords_by_link = {articles[idx]['link']: keywords for idx, keywords in zip(indices, keywords_list) if keywords}
+                if keywords_by_link:
+                    status['updated'] += await asyncio.to_thread(db.update_articles_keywords_bulk, keywords_by_link)
+                status['processed'] += len(indices)
+        except Exception as e:
+            logger.error(f"❌ 키워드 보강 실패: {e}", exc_info=True)
+        logger.info(f"🏷️ 키워드 보강 완료: {status['processed']}/{status['total']}건 처리")
+
+    def start_keyword_enrichment(self, articles: List[Dict]) -> asyncio.Task:
+        """키워드 보강을 백그라운드 태스크로 시작하고 진행 상황 집계를 준비합니다."""
+        status = self.enrichment_status
+        if not self._enrich_tasks:
+            status.update({'running': True, 'total': 0, 'processed': 0, 'updated': 0,
+                           'started_at': datetime.now().isoformat(), 'finished_at': None})
+        status['total'] += len(articles)
+        task = asyncio.create_task(self.enrich_keywords(articles))
+        self._enrich_tasks.add(task)
+        task.add_done_callback(self._finish_keyword_enrichment)
+        return task
+
+    def _finish_keyword_enrichment(self, task: asyncio.Task):
+        self._enrich_tasks.discard(task)
+        if not self._enrich_tasks:
+            self.enrichment_status.update({'running': False, 'finished_at': datetime.now().isoformat()})
+
+    async def collect_all_news_async(self, max_feeds: Optional[int] = None, use_batch_api: bool = False,
+                                     wait_for_keywords: bool = False) -> Dict:
+        """피드를 수집·저장하고, 새 기사의 키워드 보강은 백그라운드 태스크로 넘깁니다.
+
+        wait_for_keywords=True 이면 키워드 보강이 끝날 때까지 기다립니다.
+        """
         logger.info("🚀 전체 뉴스 수집 작업을 시작합니다.")
         start_time = time.time()
         feeds_to_process = FEEDS[:max_feeds] if max_feeds else FEEDS
         
-        all_articles = []
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_feed = {executor.submit(self.collect_from_feed, feed): feed for feed in feeds_to_process}
-            for future in as_completed(future_to_feed):
-                all_articles.extend(future.result())
+        # 피드가 도착하는 순서대로 링크 기준 중복을 걸러 전체 기사 리스트를 따로 만들지 않음
+        seen_links, unique_articles = set(), []
+        connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            for future in asyncio.as_completed([self.fetch_feed(session, feed) for feed in feeds_to_process]):
+                for article in await future:
+                    if article['link'] not in seen_links:
+                        seen_links.add(article['link'])
+                        unique_articles.append(article)
         
-        unique_articles = list({article['link']: article for article in all_articles}.values())
+        save_stats, batch_id, new_articles = {}, None, []
         if unique_articles:
-            save_stats = self.save_articles(unique_articles)
-        else:
-            save_stats = {}
+            save_stats, batch_id, new_articles = await asyncio.to_thread(self._store_articles, unique_articles, use_batch_api)
+
+        keywords_pending = 0
+        if new_articles and not use_batch_api:
+            keywords_pending = len(new_articles)
+            task = self.start_keyword_enrichment(new_articles)
+            if wait_for_keywords:
+                await task
         
         duration = time.time() - start_time
-        return {'status': 'success', 'duration': duration, 'stats': save_stats}
+        return {'status': 'success', 'duration': duration, 'stats': save_stats,
+                'keyword_batch_id': batch_id, 'keywords_pending': keywords_pending}
+
+    def collect_all_news(self, max_feeds: Optional[int] = None, use_batch_api: bool = False) -> Dict:
+        """스크립트 등 동기 코드에서 사용하기 위한 래퍼입니다 (키워드 보강까지 마친 뒤 반환)."""
+        return asyncio.run(self.collect_all_news_async(max_feeds, use_batch_api, wait_for_keywords=True))
 
 collector = EnhancedNewsCollector()
 
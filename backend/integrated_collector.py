@@ -4,6 +4,7 @@ Works with the existing backend system
 """
 
 import os
+import re
 import sqlite3
 import requests
 import feedparser
@@ -146,7 +147,6 @@ class NewsCollector:
             return []
         
         # Simple keyword extraction
-        import re
         words = re.findall(r'[가-힣]+|[A-Za-z]+', text.lower())
         
         # Filter common words
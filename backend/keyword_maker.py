@@ -1,12 +1,65 @@
+import asyncio
+import atexit
+import functools
+import hashlib
+import itertools
+import json
+import numpy as np
 import openai
 import os
-from typing import List
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
 from dotenv import load_dotenv
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from database import db
 
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# 호출마다 클라이언트를 새로 만들지 않고 커넥션 풀(keep-alive, TLS 세션)을 재사용
+_CLIENT = openai.OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+_ACLIENT = openai.AsyncOpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# 키워드 요청은 tenacity로 재시도하며 시도마다 요청 버킷을 차감하므로 SDK 자체 재시도는 끔 (같은 커넥션 풀 공유)
+_ACHAT_CLIENT = _ACLIENT.with_options(max_retries=0) if _ACLIENT else None
+
+# 동시 호출 시 지켜야 할 OpenAI 계정 한도 (분당 요청 수 / 분당 토큰 수)
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+
+# 키워드 추출 모델과 입력 크기 (제목과 첫 문단이면 키워드를 뽑기에 충분)
+KEYWORD_MODEL = "gpt-4o-mini"
+KEYWORD_INPUT_CHARS = 600
+KEYWORD_INPUT_TOKENS = 400
+# 단일/묶음 요청 프롬프트 템플릿 ({t}에 본문이 들어감)
+_PROMPT_TMPL = 'JSON 형식으로: {{"keywords":[...최대10개...]}}\n{t}'
+_BATCH_PROMPT_TMPL = '[[번호]] 텍스트마다 키워드 최대 10개, JSON으로: {{"1": [...], "2": [...]}}\n{t}'
+
+# 동일 텍스트(앞 KEYWORD_INPUT_CHARS자 기준)의 재호출을 막는 키워드 응답 캐시
+KEYWORD_CACHE_PATH = os.getenv("KEYWORD_CACHE_PATH", "kw_cache.db")
+_CACHE_CONN = sqlite3.connect(KEYWORD_CACHE_PATH, check_same_thread=False)
+# 커밋마다의 fsync 비용을 줄이기 위해 WAL 모드 + NORMAL 동기화 사용 (articles DB와 동일)
+_CACHE_CONN.execute("PRAGMA journal_mode=WAL")
+_CACHE_CONN.execute("PRAGMA synchronous=NORMAL")
+_CACHE_CONN.execute("CREATE TABLE IF NOT EXISTS kw (hash TEXT PRIMARY KEY, keywords TEXT, ts INTEGER)")
+_CACHE_CONN.commit()
+_CACHE_LOCK = threading.Lock()
+
+# 표현만 다른 유사 기사(임베딩 코사인 유사도 기준)의 키워드를 재사용하는 시맨틱 캐시
+ENABLE_SEMANTIC_CACHE = os.getenv("ENABLE_SEMANTIC_CACHE", "1") == "1"
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", "kw_semantic_cache")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# 조회가 이 횟수만큼 실패한 배치는 대기 목록에서 제거 (키·조직 변경 후 404 등)
+KEYWORD_BATCH_MAX_ERRORS = int(os.getenv("KEYWORD_BATCH_MAX_ERRORS", "5"))
+
 # 불용어 리스트 (모두 소문자로 변환)
 STOP_WORDS = [
     # 한국어 불용어
@@ -30,76 +83,555 @@ STOP_WORDS = [
     'than', 'that', "that's", 'the', 'their', 'theirs', 'them', 'themselves', 'then', 'there', "there's", 'these', 'they', "they'd",
     "they'll", "they're", "they've", 'this', 'those', 'through', 'to', 'too', 'under', 'until', 'up', 'very',
     'was', "wasn't", 'we', "we'd", "we'll", "we're", "we've", 'were', "weren't", 'what', "what's", 'when', "when's",
-    'where', "where's", 'which', 'while', 'who', "who's", 'whom', 'why', "why's", 'with', "won't', 'would', "wouldn't",
+    'where', "where's", 'which', 'while', 'who', "who's", 'whom', 'why', "why's", 'with', "won't", 'would', "wouldn't",
     'you', "you'd", "you'll", "you're", "you've", 'your', 'yours', 'yourself', 'yourselves',
     'news', 'article', 'report', 'inc', 'ltd', 'co', 'llc'
 ]
-# 모든 불용어를 소문자로 변환
-STOP_WORDS = [word.lower() for word in STOP_WORDS]
+@functools.lru_cache(maxsize=8192)
+def _nfc(text: str) -> str:
+    """RSS에서 자모 분리(NFD) 형태로 들어온 한글을 완성형(NFC)으로 정규화합니다. 반복되는 키워드는 캐시됩니다."""
+    return unicodedata.normalize("NFC", text)
 
+# 모든 불용어를 NFC 정규화 후 소문자로 변환하고, O(1) 조회를 위해 frozenset으로 고정
+STOP_WORDS = frozenset(_nfc(word).lower() for word in STOP_WORDS)
 
-def extract_keywords(text: str) -> List[str]:
-    """텍스트에서 키워드를 추출하고 불용어를 제거합니다."""
-    if not text or not OPENAI_API_KEY:
-        return []
-    
+# 백업 키워드 추출용 기술 용어 사전
+TECH_TERMS = [
+    'AI', '인공지능', '머신러닝', '딥러닝', '반도체', '5G', '6G',
+    'IoT', '클라우드', '빅데이터', '블록체인', '메타버스', 'VR', 'AR',
+    '로봇', '자동화', '스마트팩토리', '디지털전환', 'DX', '핀테크',
+    '전기차', '자율주행', '배터리', '태양광', '풍력', '수소',
+    '양자컴퓨팅', '사이버보안', '해킹', '랜섬웨어', '개인정보보호',
+    '스타트업', '유니콘', '벤처캐피탈', 'IPO', 'M&A'
+]
+# 호출마다 term.lower()를 반복하지 않도록 (원래 용어, 소문자 용어) 쌍을 미리 계산
+_TECH_TERMS_LOWER = tuple((term, term.lower()) for term in TECH_TERMS)
+
+# 모델 응답의 쉼표 구분자 (한글 전각 쉼표, CJK 모점 포함) 및 주변 공백
+_COMMA_RE = re.compile(r"\s*[,，、]\s*")
+
+@functools.lru_cache(maxsize=1)
+def _token_encoding():
+    """tiktoken 인코딩을 한 번만 로드합니다. 미설치이거나 인코딩 파일을 받을 수 없으면 None."""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model(KEYWORD_MODEL)
+    except Exception:
+        return None
+
+def _count_tokens(text: str) -> int:
+    encoding = _token_encoding()
+    # tiktoken이 없으면 글자 수로 넉넉히 추정 (한글은 대략 글자당 1토큰)
+    return len(encoding.encode(text)) if encoding else len(text)
+
+def _head(text: str) -> str:
+    """앞 KEYWORD_INPUT_CHARS자만 반환합니다. 대부분인 짧은 텍스트는 슬라이싱 없이 그대로 씁니다."""
+    return text if len(text) <= KEYWORD_INPUT_CHARS else text[:KEYWORD_INPUT_CHARS]
+
+def _snippet(text: str) -> str:
+    """모델에 보낼 앞부분만 잘라내고, 토큰 수가 한도를 넘으면 서버 거부 전에 미리 자릅니다."""
+    snippet = _head(text)
+    encoding = _token_encoding()
+    # 토큰 수는 UTF-8 바이트 수(글자당 최대 4바이트)를 넘지 않으므로 짧은 텍스트는 인코딩 생략
+    if encoding and len(snippet) * 4 > KEYWORD_INPUT_TOKENS:
+        tokens = encoding.encode(snippet)
+        if len(tokens) > KEYWORD_INPUT_TOKENS:
+            snippet = encoding.decode(tokens[:KEYWORD_INPUT_TOKENS])
+    return snippet
+
+def _keyword_request_body(text: str) -> Dict:
+    """단일 텍스트 키워드 추출용 Chat Completions 요청 본문을 생성합니다."""
+    return {
+        "model": KEYWORD_MODEL,
+        "messages": [
+            {"role": "system", "content": "IT 키워드 추출기."},
+            {"role": "user", "content": _PROMPT_TMPL.format(t=_snippet(text))}
+        ],
+        "response_format": {"type": "json_object"},
+        "max_tokens": 80,
+        "temperature": 0
+    }
+
+def _filter_keywords(keywords: Iterable[str], limit: int = 8) -> List[str]:
+    """키워드를 NFC로 정규화한 뒤 불용어와 한 글자 키워드를 제거하고 앞에서부터 limit개만 반환합니다.
+
+    조건 검사는 지연 평가되므로 limit개가 모이면 나머지는 검사하지 않습니다.
+    """
+    normalized = map(_nfc, keywords)
+    return list(itertools.islice((k for k in normalized if len(k) > 1 and k.lower() not in STOP_WORDS), limit))
+
+def _clean_keywords(items: list) -> List[str]:
+    """모델이 준 배열에서 문자열 항목만 남겨 공백을 정리한 뒤 _filter_keywords를 적용합니다."""
+    return _filter_keywords(k.strip() for k in items if isinstance(k, str) and k.strip())
+
+def _parse_keywords(content: str) -> List[str]:
+    """{"keywords": [...]} JSON 응답을 키워드 리스트로 변환하고 불용어를 제거합니다.
+
+    JSON이 아니면 json.JSONDecodeError가, "keywords"가 없거나 배열·문자열이 아니면 ValueError가
+    발생하므로 호출자는 백업 추출로 넘어가고 결과를 캐시하지 않습니다. 값이 배열 대신
+    문자열로 오면 쉼표(전각 쉼표·모점 포함)로 나눕니다.
+    """
+    data = json.loads(content)
+    keywords = data.get("keywords") if isinstance(data, dict) else None
+    if isinstance(keywords, str):
+        keywords = _COMMA_RE.split(keywords.strip())
+    if not isinstance(keywords, list):
+        raise ValueError(f"keywords 배열이 없는 응답: {content[:100]}")
+    return _clean_keywords(keywords)
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha1(_head(text).encode("utf-8")).hexdigest()
+
+@functools.lru_cache(maxsize=4096)
+def _cached_keywords(text_hash: str) -> Tuple[str, ...]:
+    """캐시 DB에서 키워드를 조회합니다. 미스는 KeyError로 알려 lru_cache에 남지 않게 합니다."""
+    with _CACHE_LOCK:
+        row = _CACHE_CONN.execute("SELECT keywords FROM kw WHERE hash = ?", (text_hash,)).fetchone()
+    if row is None:
+        raise KeyError(text_hash)
+    return tuple(json.loads(row[0]))
+
+def _get_cached_keywords(text: str) -> Optional[List[str]]:
     try:
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        
-        prompt = f"""
-        다음 텍스트에서 핵심 키워드를 추출해주세요. IT/기술 관련 키워드를 우선적으로 선택하고, 
-        최대 10개까지 중요한 순서대로 나열해주세요. 각 키워드는 쉼표로 구분하여 반환해주세요.
-        
-        텍스트: {text[:1000]}
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "당신은 IT/기술 뉴스의 키워드를 추출하는 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=100,
-            temperature=0.3
+        return list(_cached_keywords(_text_hash(text)))
+    except KeyError:
+        return None
+
+def _get_cached_keywords_many(texts: List[str]) -> List[Optional[List[str]]]:
+    """여러 텍스트의 캐시를 조회합니다. 빈 텍스트와 미스는 None. 이벤트 루프에서는 asyncio.to_thread로 호출합니다."""
+    return [_get_cached_keywords(text) if text else None for text in texts]
+
+def _store_cached_keywords_many(rows: List[Tuple[str, List[str]]]):
+    """(텍스트, 키워드) 쌍들을 executemany 한 번과 커밋 한 번으로 저장합니다. 이벤트 루프에서는 asyncio.to_thread로 호출합니다."""
+    if not rows:
+        return
+    now = int(time.time())
+    with _CACHE_LOCK:
+        _CACHE_CONN.executemany(
+            "INSERT OR REPLACE INTO kw (hash, keywords, ts) VALUES (?, ?, ?)",
+            [(_text_hash(text), json.dumps(keywords, ensure_ascii=False), now) for text, keywords in rows]
         )
-        
-        keywords_text = response.choices[0].message.content.strip()
-        raw_keywords = [k.strip() for k in keywords_text.split(',') if k.strip()]
-        
-        # 불용어 처리
-        filtered_keywords = [
-            k for k in raw_keywords 
-            if k.lower() not in STOP_WORDS and len(k) > 1
-        ]
-        
-        return filtered_keywords[:8]
-        
+        _CACHE_CONN.commit()
+
+class SemanticKeywordCache:
+    """임베딩 벡터 → 키워드 인덱스. 단위 벡터 행렬과의 내적(GEMV) 한 번으로 최근접 항목을 찾습니다.
+
+    새 항목은 미리 할당한 _pending 배열에 쌓았다가 rebuild_every개마다 연속된 float32 행렬로 합치고
+    디스크에 저장합니다.
+    """
+
+    def __init__(self, path: str, threshold: float, rebuild_every: int = 1000):
+        self.path = path
+        self.threshold = threshold
+        self.rebuild_every = rebuild_every
+        self._matrix: Optional[np.ndarray] = None
+        self._pending: Optional[np.ndarray] = None
+        self._pending_count = 0
+        self._keywords: List[List[str]] = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            matrix = np.load(f"{self.path}.npy")
+            with open(f"{self.path}.json", encoding="utf-8") as f:
+                keywords = json.load(f)
+        except (OSError, ValueError):
+            return
+        if len(matrix) == len(keywords):
+            self._matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+            self._keywords = keywords
+
+    def _rebuild(self):
+        if self._pending_count:
+            pending = self._pending[:self._pending_count]
+            self._matrix = pending.copy() if self._matrix is None else np.vstack([self._matrix, pending])
+            self._pending_count = 0
+
+    def lookup(self, vector: np.ndarray) -> Optional[List[str]]:
+        with self._lock:
+            if not self._keywords:
+                return None
+            sims = np.concatenate([
+                self._matrix @ vector if self._matrix is not None else np.empty(0, dtype=np.float32),
+                self._pending[:self._pending_count] @ vector if self._pending_count else np.empty(0, dtype=np.float32),
+            ])
+            best = int(sims.argmax())
+            return list(self._keywords[best]) if sims[best] > self.threshold else None
+
+    def add(self, vector: np.ndarray, keywords: List[str]):
+        with self._lock:
+            if self._pending is None:
+                self._pending = np.empty((self.rebuild_every, len(vector)), dtype=np.float32)
+            self._pending[self._pending_count] = vector
+            self._pending_count += 1
+            self._keywords.append(list(keywords))
+            if self._pending_count >= self.rebuild_every:
+                self._save_locked()
+
+    def save(self):
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        self._rebuild()
+        if self._matrix is None:
+            return
+        np.save(f"{self.path}.npy", self._matrix)
+        with open(f"{self.path}.json", "w", encoding="utf-8") as f:
+            json.dump(self._keywords, f, ensure_ascii=False)
+
+_SEMANTIC_CACHE = SemanticKeywordCache(SEMANTIC_CACHE_PATH, SEMANTIC_CACHE_THRESHOLD) if ENABLE_SEMANTIC_CACHE else None
+if _SEMANTIC_CACHE is not None:
+    atexit.register(_SEMANTIC_CACHE.save)
+
+def _unit_vectors(response, count: int) -> List[Optional[np.ndarray]]:
+    """임베딩 응답을 입력 순서대로 정렬된 단위 벡터 리스트로 변환합니다."""
+    vectors: List[Optional[np.ndarray]] = [None] * count
+    for item in response.data:
+        vector = np.asarray(item.embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        vectors[item.index] = vector / norm if norm else vector
+    return vectors
+
+def _group_near_duplicates(texts: List[str], indices: List[int],
+                           vectors: Dict[int, Optional[np.ndarray]]) -> Dict[int, List[int]]:
+    """같은 텍스트(_text_hash 기준)와 임베딩 유사도가 SEMANTIC_CACHE_THRESHOLD를 넘는 텍스트를 묶어
+    {대표: [나머지]}로 반환합니다.
+
+    임베딩 비교는 대표끼리만 하므로 시맨틱 캐시가 꺼져 있어도 같은 텍스트는 한 번만 요청됩니다.
+    """
+    groups: Dict[int, List[int]] = {}
+    by_hash: Dict[str, int] = {}
+    for idx in indices:
+        representative = by_hash.setdefault(_text_hash(texts[idx]), idx)
+        groups.setdefault(representative, [])
+        if representative != idx:
+            groups[representative].append(idx)
+
+    embedded = [idx for idx in groups if vectors[idx] is not None]
+    if len(embedded) < 2:
+        return groups
+
+    matrix = np.stack([vectors[idx] for idx in embedded])
+    sims = matrix @ matrix.T
+    assigned = np.zeros(len(embedded), dtype=bool)
+    for i, idx in enumerate(embedded):
+        if assigned[i]:
+            continue
+        duplicates = np.flatnonzero((sims[i, i + 1:] > SEMANTIC_CACHE_THRESHOLD) & ~assigned[i + 1:]) + i + 1
+        assigned[duplicates] = True
+        for j in duplicates:
+            groups[idx].extend((embedded[j], *groups.pop(embedded[j])))
+    return groups
+
+def _semantic_pass(texts: List[str], misses: List[int], vectors: Dict[int, Optional[np.ndarray]],
+                   results: List[List[str]]) -> Tuple[Dict[int, List[int]], List[Tuple[str, List[str]]]]:
+    """캐시 미스를 시맨틱 캐시로 채우고, 남은 텍스트는 같은 호출 안에서 유사한 것끼리 묶습니다.
+
+    같은 크롤링에서 여러 매체가 낸 같은 기사는 아직 캐시에 없으므로, 이렇게 묶어 대표 하나만
+    API로 보냅니다. (_group_near_duplicates 형식의 그룹, 캐시에 저장할 (텍스트, 키워드) 쌍)을 반환합니다.
+    """
+    remaining: List[int] = []
+    cache_rows: List[Tuple[str, List[str]]] = []
+    for idx in misses:
+        similar = _SEMANTIC_CACHE.lookup(vectors[idx]) if vectors[idx] is not None else None
+        if similar is not None:
+            results[idx] = similar
+            cache_rows.append((texts[idx], similar))
+        else:
+            remaining.append(idx)
+    return _group_near_duplicates(texts, remaining, vectors), cache_rows
+
+def _apply_group_keywords(texts: List[str], members: Iterable[int], keywords: Optional[List[str]],
+                          vector: Optional[np.ndarray], results: List[List[str]]) -> List[Tuple[str, List[str]]]:
+    """대표의 추출 결과를 그룹 전체에 채우고 시맨틱 캐시에 추가한 뒤, 캐시에 저장할 (텍스트, 키워드) 쌍을 반환합니다.
+
+    keywords가 None이거나 비어 있으면 캐시에 남기지 않고 각자 백업 추출합니다.
+    """
+    if not keywords:
+        for idx in members:
+            results[idx] = extract_simple_keywords(texts[idx])
+        return []
+    for idx in members:
+        results[idx] = list(keywords)
+    if vector is not None:
+        _SEMANTIC_CACHE.add(vector, keywords)
+    return [(texts[idx], keywords) for idx in members]
+
+def _batch_request_body(texts: List[str]) -> Dict:
+    """여러 텍스트에 [[번호]]를 붙여 한 번에 보내는 Chat Completions 요청 본문을 생성합니다."""
+    numbered = "\n".join(f"[[{i}]] {_snippet(t)}" for i, t in enumerate(texts, start=1))
+    return {
+        "model": KEYWORD_MODEL,
+        "messages": [
+            {"role": "system", "content": "IT 키워드 추출기."},
+            {"role": "user", "content": _BATCH_PROMPT_TMPL.format(t=numbered)}
+        ],
+        "response_format": {"type": "json_object"},
+        "max_tokens": 60 * len(texts),
+        "temperature": 0
+    }
+
+def _batch_item_keywords(parsed, number: int) -> Optional[List[str]]:
+    """묶음 응답에서 number번 텍스트의 키워드를 꺼냅니다. 누락되거나 형식이 잘못되면 None."""
+    raw_keywords = parsed.get(str(number)) if isinstance(parsed, dict) else None
+    return _clean_keywords(raw_keywords) if isinstance(raw_keywords, list) else None
+
+class _RateBudget:
+    """프로세스 전체가 공유하는 RPM/TPM 토큰 버킷. 요청 시도마다 차감됩니다.
+
+    잔량은 마지막 갱신 이후 경과 시간에 비례해 채워지므로 별도 refiller 태스크가 없고,
+    asyncio.run이 매번 새 이벤트 루프를 만드는 동기 래퍼에서도 같은 버킷이 유지됩니다.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._rpm_budget = float(rpm)
+        self._tpm_budget = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, tokens: int) -> float:
+        """잔량이 충분하면 차감하고 0을, 부족하면 채워질 때까지 기다릴 초를 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            self._rpm_budget = min(self.rpm, self._rpm_budget + self.rpm * elapsed / 60)
+            self._tpm_budget = min(self.tpm, self._tpm_budget + self.tpm * elapsed / 60)
+            if self._rpm_budget >= 1 and self._tpm_budget >= tokens:
+                self._rpm_budget -= 1
+                self._tpm_budget -= tokens
+                return 0.0
+            return max((1 - self._rpm_budget) * 60 / self.rpm, (tokens - self._tpm_budget) * 60 / self.tpm)
+
+    async def acquire(self, tokens: int):
+        tokens = min(tokens, self.tpm)
+        while (wait := self._try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+_RATE_BUDGET = _RateBudget(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, max=20),
+    retry=retry_if_exception_type((
+        openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError
+    )),
+    reraise=True
+)
+async def _achat_completion(body: Dict, tokens: int):
+    await _RATE_BUDGET.acquire(tokens)
+    return await _ACHAT_CLIENT.chat.completions.create(**body)
+
+async def _aembed_texts(texts: List[str]) -> List[Optional[np.ndarray]]:
+    if _SEMANTIC_CACHE is None or _ACLIENT is None or not texts:
+        return [None] * len(texts)
+    try:
+        response = await _ACLIENT.embeddings.create(model=EMBEDDING_MODEL, input=[_head(t) for t in texts])
     except Exception as e:
-        print(f"키워드 추출 오류: {e}")
-        # 오류 시 기본 키워드 추출 로직 (간단한 방식)
-        return extract_simple_keywords(text)
+        print(f"임베딩 생성 오류: {e}")
+        return [None] * len(texts)
+    return _unit_vectors(response, len(texts))
+
+async def _arequest_keywords_batch(texts: List[str]) -> Dict[str, list]:
+    """여러 텍스트를 인덱스를 붙여 한 번의 요청으로 보내고 JSON 응답을 반환합니다. 실패하면 오류를 출력하고 빈 dict를 반환합니다."""
+    body = _batch_request_body(texts)
+    try:
+        response = await _achat_completion(body, _count_tokens(body["messages"][-1]["content"]) + body["max_tokens"])
+        return json.loads(response.choices[0].message.content)
+    except Exception as e:
+        print(f"배치 키워드 추출 오류: {e}")
+        return {}
+
+async def _resolve_cached(texts: List[str]) -> Tuple[List[List[str]], Dict[int, List[int]], Dict[int, Optional[np.ndarray]]]:
+    """캐시·시맨틱 캐시로 채울 수 있는 결과를 채우고, 남은 텍스트를 API로 보낼 그룹으로 묶습니다.
+
+    (입력 순서의 결과 리스트, _group_near_duplicates 형식의 그룹, 인덱스별 임베딩)을 반환합니다.
+    빈 텍스트와 클라이언트가 없을 때의 캐시 미스는 빈 리스트로 남습니다.
+    """
+    results: List[List[str]] = [[] for _ in texts]
+    misses: List[int] = []
+    for idx, cached in enumerate(await asyncio.to_thread(_get_cached_keywords_many, texts)):
+        if cached is not None:
+            results[idx] = cached
+        elif texts[idx]:
+            misses.append(idx)
+
+    if not misses or _ACLIENT is None:
+        return results, {}, {}
+
+    vectors = dict(zip(misses, await _aembed_texts([texts[idx] for idx in misses])))
+    groups, cache_rows = _semantic_pass(texts, misses, vectors, results)
+    await asyncio.to_thread(_store_cached_keywords_many, cache_rows)
+    return results, groups, vectors
+
+async def iter_keyword_batches(texts: List[str], batch_size: int = 20, concurrency: int = 10):
+    """여러 텍스트의 키워드를 batch_size개씩 묶은 요청으로 동시에 추출하고, 끝나는 순서대로
+    (입력 인덱스 리스트, 각 인덱스의 키워드 리스트) 쌍을 내보냅니다.
+
+    캐시·시맨틱 캐시로 채워진 텍스트와 빈 텍스트는 첫 쌍으로 한꺼번에 나옵니다. 같은 호출 안의
+    유사한 텍스트는 대표 하나만 요청하며, 동시 요청 수는 concurrency로, 처리량은 모든 호출자가
+    공유하는 OPENAI_RPM_LIMIT/OPENAI_TPM_LIMIT 버킷으로 제한합니다. 일시적 오류는 지수 백오프로
+    최대 3회 시도하고, 응답에서 빠진 항목은 extract_simple_keywords 결과로 대체됩니다.
+    """
+    results, groups, vectors = await _resolve_cached(texts)
+    grouped = {member for idx, duplicates in groups.items() for member in (idx, *duplicates)}
+    ready = [idx for idx in range(len(texts)) if idx not in grouped]
+    if ready:
+        yield ready, [results[idx] for idx in ready]
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def extract_chunk(chunk: List[int]) -> List[int]:
+        async with sem:
+            parsed = await _arequest_keywords_batch([texts[idx] for idx in chunk])
+        members: List[int] = []
+        cache_rows: List[Tuple[str, List[str]]] = []
+        for i, idx in enumerate(chunk, start=1):
+            group = (idx, *groups[idx])
+            cache_rows.extend(_apply_group_keywords(texts, group, _batch_item_keywords(parsed, i), vectors[idx], results))
+            members.extend(group)
+        # SQLite 쓰기(커밋)는 이벤트 루프를 막지 않도록 묶음마다 한 번, 스레드에서 실행
+        await asyncio.to_thread(_store_cached_keywords_many, cache_rows)
+        return members
+
+    representatives = list(groups)
+    tasks = [asyncio.create_task(extract_chunk(representatives[start:start + batch_size]))
+             for start in range(0, len(representatives), batch_size)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            members = await next_done
+            yield members, [results[idx] for idx in members]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def extract_keywords_many(texts: List[str], batch_size: int = 20, concurrency: int = 10) -> List[List[str]]:
+    """여러 텍스트의 키워드를 AsyncOpenAI로 추출해 입력 순서대로 반환합니다. 규칙은 iter_keyword_batches와 같습니다."""
+    results: List[List[str]] = [[] for _ in texts]
+    async for indices, keywords_list in iter_keyword_batches(texts, batch_size, concurrency):
+        for idx, keywords in zip(indices, keywords_list):
+            results[idx] = keywords
+    return results
+
+async def extract_keywords_async(text: str) -> List[str]:
+    """텍스트 하나의 키워드를 추출합니다. extract_keywords_many와 같은 경로를 사용합니다."""
+    return (await extract_keywords_many([text]))[0]
+
+def extract_keywords(text: str) -> List[str]:
+    """extract_keywords_async의 동기 래퍼. 이벤트 루프 밖에서만 호출해야 합니다."""
+    return asyncio.run(extract_keywords_async(text))
+
+def extract_keywords_batch(texts: List[str], batch_size: int = 20) -> List[List[str]]:
+    """extract_keywords_many의 동기 래퍼. 이벤트 루프 밖에서만 호출해야 합니다."""
+    return asyncio.run(extract_keywords_many(texts, batch_size))
+
+def _link_hash(link: str) -> str:
+    return hashlib.sha1(link.encode("utf-8")).hexdigest()
+
+def submit_keyword_batch(articles: List[Dict]) -> Optional[str]:
+    """기사 키워드 추출 요청을 OpenAI Batch API(24시간 처리)로 제출합니다.
+
+    각 요청의 custom_id는 기사 링크의 해시이며, 해시→링크 매핑과 batch_id는
+    pending_keyword_batches 테이블에 저장되어 drain_keyword_batches에서 사용됩니다.
+    """
+    if not articles or _CLIENT is None:
+        return None
+
+    link_map: Dict[str, str] = {}
+
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False) as f:
+        for article in articles:
+            custom_id = _link_hash(article['link'])
+            if custom_id in link_map:
+                continue
+            link_map[custom_id] = article['link']
+            text = f"{article.get('title', '')} {article.get('summary', '')}"
+            f.write(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _keyword_request_body(text)
+            }, ensure_ascii=False) + "\n")
+        batch_path = f.name
+
+    try:
+        with open(batch_path, "rb") as f:
+            batch_file = _CLIENT.files.create(file=f, purpose="batch")
+        batch = _CLIENT.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+    finally:
+        os.remove(batch_path)
+
+    db.add_pending_keyword_batch(batch.id, link_map)
+    return batch.id
+
+async def drain_keyword_batches() -> Dict[str, int]:
+    """대기 중인 배치의 상태를 확인하고, 완료된 배치 결과로 기사 키워드를 갱신합니다.
+
+    조회에 실패한 배치는 failed로 집계하고 다음 배치로 넘어가며, KEYWORD_BATCH_MAX_ERRORS회
+    실패가 누적되면 대기 목록에서 제거합니다.
+    """
+    stats = {'completed': 0, 'pending': 0, 'failed': 0, 'updated': 0}
+    pending = db.get_pending_keyword_batches()
+    if not pending or _ACLIENT is None:
+        stats['pending'] = len(pending)
+        return stats
+
+    for row in pending:
+        try:
+            batch = await _ACLIENT.batches.retrieve(row['batch_id'])
+            if batch.status == "completed" and batch.output_file_id:
+                output = (await _ACLIENT.files.content(batch.output_file_id)).text
+            else:
+                output = ""
+        except Exception as e:
+            # 한 배치의 오류가 나머지 배치 처리를 막지 않도록 기록만 하고 넘어감
+            print(f"배치 {row['batch_id']} 조회 오류: {e}")
+            if db.record_keyword_batch_error(row['batch_id']) >= KEYWORD_BATCH_MAX_ERRORS:
+                db.remove_pending_keyword_batch(row['batch_id'])
+            stats['failed'] += 1
+            continue
+
+        if batch.status == "completed":
+            keywords_by_link: Dict[str, List[str]] = {}
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    result = json.loads(line)
+                    link = row['link_map'].get(result['custom_id'])
+                    response = result.get('response') or {}
+                    if not link or response.get('status_code') != 200:
+                        continue
+                    keywords = _parse_keywords(response['body']['choices'][0]['message']['content'])
+                except (ValueError, KeyError, IndexError, TypeError) as e:
+                    print(f"배치 결과 파싱 오류: {e}")
+                    continue
+                # 빈 결과로 저장 시 추출해 둔 백업 키워드를 덮어쓰지 않도록 건너뜀
+                if keywords:
+                    keywords_by_link[link] = keywords
+            if keywords_by_link:
+                stats['updated'] += db.update_articles_keywords_bulk(keywords_by_link)
+            db.remove_pending_keyword_batch(row['batch_id'])
+            stats['completed'] += 1
+        elif batch.status in ("failed", "expired", "cancelled"):
+            db.remove_pending_keyword_batch(row['batch_id'])
+            stats['failed'] += 1
+        else:
+            stats['pending'] += 1
+
+    return stats
 
 def extract_simple_keywords(text: str) -> List[str]:
     """간단한 키워드 추출 (백업 방식) 및 불용어 처리"""
-    keywords = []
-    tech_terms = [
-        'AI', '인공지능', '머신러닝', '딥러닝', '반도체', '5G', '6G',
-        'IoT', '클라우드', '빅데이터', '블록체인', '메타버스', 'VR', 'AR',
-        '로봇', '자동화', '스마트팩토리', '디지털전환', 'DX', '핀테크',
-        '전기차', '자율주행', '배터리', '태양광', '풍력', '수소',
-        '양자컴퓨팅', '사이버보안', '해킹', '랜섬웨어', '개인정보보호',
-        '스타트업', '유니콘', '벤처캐피탈', 'IPO', 'M&A'
-    ]
-    
-    text_lower = text.lower()
-    for term in tech_terms:
-        if term.lower() in text_lower:
-            keywords.append(term)
-            
-    # 불용어 처리
-    filtered_keywords = [
-        k for k in keywords 
-        if k.lower() not in STOP_WORDS and len(k) > 1
-    ]
-    
-    return filtered_keywords[:8]
\ No newline at end of file
+    text_lower = unicodedata.normalize("NFC", text).lower()
+    keywords = [term for term, lowered in _TECH_TERMS_LOWER if lowered in text_lower]
+
+    return _filter_keywords(keywords)
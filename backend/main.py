@@ -1,6 +1,5 @@
 # backend/main.py (카테고리 기능이 추가된 최종 버전)
 
-import asyncio
 import logging
 from typing import List, Dict, Optional
 
@@ -10,6 +9,7 @@ from pydantic import BaseModel, ConfigDict
 
 from database import db
 from enhanced_news_collector import collector
+from keyword_maker import drain_keyword_batches
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -97,6 +97,21 @@ async def get_keyword_network(limit: int = 30):
     except Exception as e:
         raise HTTPException(status_code=500, detail="네트워크 데이터 생성 중 오류 발생")
 
+@app.get("/api/keywords/status")
+async def get_keyword_enrichment_status():
+    """수집 후 백그라운드에서 진행되는 키워드 보강 작업의 진행 상황을 반환합니다."""
+    return collector.enrichment_status
+
+@app.post("/api/keywords/drain")
+async def drain_keywords():
+    """Batch API로 제출된 키워드 추출 결과를 확인하고 완료된 결과를 기사에 반영합니다."""
+    try:
+        stats = await drain_keyword_batches()
+        return {"status": "success", **stats}
+    except Exception as e:
+        logger.error(f"키워드 배치 반영 오류: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="키워드 배치 반영 중 오류 발생")
+
 @app.get("/api/categories/stats", response_model=List[CategoryStat])
 async def get_category_stats():
     """[추가된 기능] 대분류별 기사 수를 집계하여 반환합니다."""
@@ -124,18 +139,19 @@ async def remove_favorite(article_id: int):
         raise HTTPException(status_code=500, detail="즐겨찾기 제거 중 오류 발생")
 
 @app.post("/api/collect-news-now")
-async def collect_news_now(max_feeds: Optional[int] = Query(None)):
+async def collect_news_now(max_feeds: Optional[int] = Query(None), use_batch_api: bool = Query(False)):
     try:
         logger.info("🚀 뉴스 수집 요청을 받았습니다.")
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, collector.collect_all_news, max_feeds)
+        result = await collector.collect_all_news_async(max_feeds, use_batch_api)
         
-        total_articles = db.execute_query("SELECT COUNT(*) as count FROM articles")[0]['count']
+        total_articles = db.count_articles()
         stats = result.get('stats', {})
         return {
             "message": "뉴스 수집 완료", "status": "success",
             "duration": result.get('duration'), "inserted": stats.get('inserted', 0),
-            "total_articles": total_articles, "updated": stats.get('updated', 0)
+            "total_articles": total_articles, "updated": stats.get('updated', 0),
+            "keyword_batch_id": result.get('keyword_batch_id'),
+            "keywords_pending": result.get('keywords_pending', 0)
         }
     except Exception as e:
         logger.error(f"❌ 뉴스 수집 중 심각한 오류 발생: {e}", exc_info=True)